@@ -1,19 +1,27 @@
 # app.py - Enhanced Backend for Quantum-Blockchain Voting System
 
 import os
-import json
 import base64
 import uuid
 import hashlib
 import random
+import secrets
 import time
+import atexit
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
 from datetime import datetime
-from flask import Flask, request, jsonify, send_from_directory
+from typing import Optional
+import orjson
+from flask import Flask, Response, request, send_from_directory
 from flask_cors import CORS
 from werkzeug.security import generate_password_hash, check_password_hash
 from blockchain import SimpleBlockchain
 from qkd_bb84 import bb84_shared_key_ibm as bb84_shared_key
-from crypto_utils import aes_encrypt, aes_decrypt
+from crypto_utils import aes_encrypt_bytes, aes_decrypt
 
 # Configuration
 DATA_DIR = "data"
@@ -21,58 +29,335 @@ os.makedirs(DATA_DIR, exist_ok=True)
 
 # File paths for persistent storage
 VOTERS_FILE = os.path.join(DATA_DIR, "voters.json")
-VOTES_FILE = os.path.join(DATA_DIR, "votes.json")
-CHAIN_FILE = os.path.join(DATA_DIR, "chain.json")
+VOTES_LOG_FILE = os.path.join(DATA_DIR, "votes.ndjson")
+LEGACY_VOTES_FILE = os.path.join(DATA_DIR, "votes.json")
+CHAIN_FILE = os.path.join(DATA_DIR, "chain.jsonl")
+LEGACY_CHAIN_FILE = os.path.join(DATA_DIR, "chain.json")
 FRAUD_FILE = os.path.join(DATA_DIR, "fraud.json")
 OFFICERS_FILE = os.path.join(DATA_DIR, "officers.json")
 PARTIES_FILE = os.path.join(DATA_DIR, "parties.json")
-SESSIONS_FILE = os.path.join(DATA_DIR, "sessions.json")
+ACTIVITY_LOG_FILE = os.path.join(DATA_DIR, "activity_log.ndjson")
+LEGACY_ACTIVITY_LOG_FILE = os.path.join(DATA_DIR, "activity_log.json")
 
 ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "admin123")
+ACTIVITY_LOG_TAIL_SIZE = 100  # entries served by /activity_log
+RESPONSE_CACHE_TTL = 1.0  # seconds home/status payloads are reused
+
+# Pre-generated BB84 vote keys
+QUANTUM_KEY_LENGTH = 32
+KEY_POOL_SIZE = 32
+KEY_POOL_TIMEOUT = 5  # seconds cast_vote waits before generating inline
+
+# Write-back settings for state files
+FLUSH_INTERVAL = 0.5  # seconds between background flushes
+FLUSH_BATCH_SIZE = 16  # mutations before a request forces a flush
 
 def load_json(path, default):
     """Load JSON data from file with error handling."""
     try:
         if not os.path.exists(path):
-            with open(path, "w") as f:
-                json.dump(default, f, indent=2)
-        with open(path, "r") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError) as e:
+            save_json(path, default)
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    except (orjson.JSONDecodeError, IOError) as e:
         print(f"Error loading {path}: {e}")
         return default
 
+def write_json_tmp(path, data):
+    """Write compact JSON to a temp file beside `path` and return its path."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(orjson.dumps(data))
+        # Durable before the caller's os.replace, so a power loss cannot leave an empty file
+        f.flush()
+        os.fsync(f.fileno())
+    return tmp_path
+
+def write_ndjson_atomic(path, entries):
+    """Write entries as NDJSON to a temp file, then swap it into place."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        for entry in entries:
+            f.write(orjson.dumps(entry) + b"\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
 def save_json(path, data):
-    """Save JSON data to file with error handling."""
+    """Atomically save compact JSON data to file with error handling."""
     try:
-        with open(path, "w") as f:
-            json.dump(data, f, indent=2)
+        os.replace(write_json_tmp(path, data), path)
         return True
-    except (IOError, TypeError) as e:
+    except (IOError, orjson.JSONEncodeError) as e:
         print(f"Error saving {path}: {e}")
         return False
 
+def json_response(data, status=200):
+    """Build a JSON response serialized with orjson instead of jsonify."""
+    return Response(orjson.dumps(data), status=status, mimetype="application/json")
+
+_TS_CACHE = (0, "")
+
+def now_iso():
+    """Current local time as an ISO string, formatted at most once per second."""
+    global _TS_CACHE
+    now = int(time.time())
+    cached = _TS_CACHE
+    if cached[0] != now:
+        cached = _TS_CACHE = (now, datetime.fromtimestamp(now).isoformat())
+    return cached[1]
+
+class DirtyTracker:
+    """Write-back cache that coalesces state file saves into batched flushes."""
+
+    def __init__(self, sources, batch_size=FLUSH_BATCH_SIZE, interval=FLUSH_INTERVAL):
+        self.sources = sources  # path -> callable returning the current data
+        self.batch_size = batch_size
+        self.interval = interval
+        self._dirty = set()
+        self._pending = 0
+        self._lock = threading.RLock()
+        
+        threading.Thread(target=self._run, daemon=True).start()
+        atexit.register(self.flush)
+
+    def mark_dirty(self, paths):
+        """Record that the given state files need to be written."""
+        with self._lock:
+            self._dirty.update(paths)
+            self._pending += 1
+
+    def flush_if_batch_full(self):
+        """Flush immediately once enough mutations have accumulated."""
+        if self._pending >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write every dirty file; failed writes stay dirty for the next flush."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            self._pending = 0
+            
+            # Stage all payloads first, then swap them in back to back
+            staged = []
+            for path in dirty:
+                try:
+                    staged.append((write_json_tmp(path, self.sources[path]()), path))
+                except (IOError, orjson.JSONEncodeError) as e:
+                    print(f"Error saving {path}: {e}")
+                    self._dirty.add(path)
+            
+            for tmp_path, path in staged:
+                try:
+                    os.replace(tmp_path, path)
+                except OSError as e:
+                    print(f"Error saving {path}: {e}")
+                    self._dirty.add(path)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            if self._dirty:
+                self.flush()
+
+def read_log_tail(path, count, chunk_size=8192):
+    """Read the last `count` entries of an NDJSON file by seeking from the end."""
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            data = b""
+            while pos > 0 and data.count(b"\n") <= count:
+                step = min(chunk_size, pos)
+                pos -= step
+                f.seek(pos)
+                data = f.read(step) + data
+    except IOError as e:
+        print(f"Error reading {path}: {e}")
+        return []
+    
+    entries = []
+    for line in data.splitlines()[-count:]:
+        try:
+            entries.append(orjson.loads(line))
+        except orjson.JSONDecodeError:
+            continue  # partial line from an interrupted write
+    return entries
+
+def iter_ndjson(path):
+    """Yield entries from an NDJSON file, skipping partial or corrupt lines."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                yield orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue
+
+def count_lines(path, chunk_size=1 << 16):
+    """Count newline-terminated entries in a file."""
+    try:
+        with open(path, "rb") as f:
+            return sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(chunk_size), b""))
+    except IOError:
+        return 0
+
+# Migrate the old whole-file JSON log to NDJSON once
+if not os.path.exists(ACTIVITY_LOG_FILE) and os.path.exists(LEGACY_ACTIVITY_LOG_FILE):
+    write_ndjson_atomic(ACTIVITY_LOG_FILE, load_json(LEGACY_ACTIVITY_LOG_FILE, []))
+
+# Append-only activity log with the most recent entries mirrored in memory
+ACTIVITY_LOG_TAIL = deque(read_log_tail(ACTIVITY_LOG_FILE, ACTIVITY_LOG_TAIL_SIZE),
+                          maxlen=ACTIVITY_LOG_TAIL_SIZE)
+_ACTIVITY_LOG_STATS = {"total": count_lines(ACTIVITY_LOG_FILE)}
+_ACTIVITY_LOG_LOCK = threading.Lock()
+_ACTIVITY_LOG = open(ACTIVITY_LOG_FILE, "ab", buffering=0)
+atexit.register(_ACTIVITY_LOG.close)
+
 def log_activity(activity, user_id=None, details=None):
     """Log system activities for audit trail."""
     log_entry = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now_iso(),
         "activity": activity,
         "user_id": user_id,
         "details": details
     }
     
-    log_file = os.path.join(DATA_DIR, "activity_log.json")
-    logs = load_json(log_file, [])
-    logs.append(log_entry)
-    save_json(log_file, logs)
+    line = orjson.dumps(log_entry) + b"\n"
+    with _ACTIVITY_LOG_LOCK:
+        try:
+            _ACTIVITY_LOG.write(line)
+        except IOError as e:
+            print(f"Error writing {ACTIVITY_LOG_FILE}: {e}")
+        ACTIVITY_LOG_TAIL.append(log_entry)
+        _ACTIVITY_LOG_STATS["total"] += 1
+
+@dataclass(slots=True)
+class Voter:
+    """Registered voter record; serialized to voters.json by orjson."""
+    name: str
+    password: str
+    iris_sample: str
+    session_key: Optional[str] = None
+    session_id: Optional[str] = None
+    has_voted: bool = False
+    biometric_verified: Optional[str] = None
+    biometric_type: Optional[str] = None
+    vote_timestamp: Optional[str] = None
+    registered_at: str = ""
+    status: str = "active"
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a Voter from stored JSON, ignoring unknown keys."""
+        return cls(**{key: value for key, value in data.items() if key in _VOTER_FIELDS})
+
+_VOTER_FIELDS = frozenset(f.name for f in fields(Voter))
 
 # Load all data at startup
-VOTERS = load_json(VOTERS_FILE, {})
-VOTES = load_json(VOTES_FILE, {})
+VOTERS = {vid: Voter.from_dict(v) for vid, v in load_json(VOTERS_FILE, {}).items()}
+VOTES = {}
 FRAUDS = load_json(FRAUD_FILE, [])
 OFFICERS = load_json(OFFICERS_FILE, [])
 PARTIES = load_json(PARTIES_FILE, [])
-SESSIONS = load_json(SESSIONS_FILE, {})
+SESSIONS = {}  # login sessions are ephemeral and kept in memory only
+
+# Migrate the old whole-file votes JSON to the NDJSON vote log once
+if not os.path.exists(VOTES_LOG_FILE) and os.path.exists(LEGACY_VOTES_FILE):
+    write_ndjson_atomic(VOTES_LOG_FILE, (
+        {"voter_id": voter_id, **record}
+        for voter_id, records in load_json(LEGACY_VOTES_FILE, {}).items()
+        for record in records))
+
+# Append-only vote log, replayed into VOTES at startup
+_VOTERS_BEHIND_LOG = False
+_LOGGED_PARTY_VOTES = {}
+for record in iter_ndjson(VOTES_LOG_FILE):
+    voter_id = record.pop("voter_id", None)
+    VOTES.setdefault(voter_id, []).append(record)
+    if "party_name" in record:
+        _LOGGED_PARTY_VOTES[record["party_name"]] = _LOGGED_PARTY_VOTES.get(record["party_name"], 0) + 1
+    # voters.json is write-back and can trail the log after a crash
+    voter = VOTERS.get(voter_id)
+    if voter is not None and not voter.has_voted:
+        voter.has_voted = True
+        voter.vote_timestamp = record.get("timestamp")
+        _VOTERS_BEHIND_LOG = True
+
+# parties.json tallies are write-back as well. Neither source overcounts: the log misses
+# votes whose encryption failed (and pre-migration records carry no party_name), the
+# tallies miss votes cast since the last flush, so each party takes the larger count
+_PARTIES_BEHIND_LOG = False
+for party in PARTIES:
+    logged = _LOGGED_PARTY_VOTES.get(party["party_name"], 0)
+    if logged > party.get("votes", 0):
+        party["votes"] = logged
+        _PARTIES_BEHIND_LOG = True
+_VOTES_LOG_LOCK = threading.Lock()
+_VOTES_LOG = open(VOTES_LOG_FILE, "ab", buffering=0)
+atexit.register(_VOTES_LOG.close)
+
+def append_vote(voter_id, vote_record):
+    """Record a vote in memory and append it to the vote log."""
+    VOTES.setdefault(voter_id, []).append(vote_record)
+    line = orjson.dumps({"voter_id": voter_id, **vote_record}) + b"\n"
+    with _VOTES_LOG_LOCK:
+        try:
+            _VOTES_LOG.write(line)
+        except IOError as e:
+            print(f"Error writing {VOTES_LOG_FILE}: {e}")
+
+def clear_vote_log():
+    """Truncate the vote log on system reset."""
+    with _VOTES_LOG_LOCK:
+        _VOTES_LOG.truncate(0)
+
+# Lookup indexes over FRAUDS / OFFICERS / PARTIES, kept in sync on mutation
+FRAUDS_SET = set()
+OFFICERS_BY_NUMBER = {}
+OFFICERS_BY_KEY = {}
+PARTIES_BY_NAME_LC = {}  # keyed by lowercased party name
+PARTIES_BY_SYMBOL = {}
+
+def rebuild_indexes():
+    """Rebuild fraud, officer and party lookup indexes from the loaded lists."""
+    FRAUDS_SET.clear()
+    FRAUDS_SET.update(FRAUDS)
+    OFFICERS_BY_NUMBER.clear()
+    OFFICERS_BY_KEY.clear()
+    PARTIES_BY_NAME_LC.clear()
+    PARTIES_BY_SYMBOL.clear()
+    for officer in OFFICERS:
+        OFFICERS_BY_NUMBER[officer.get("number")] = officer
+        OFFICERS_BY_KEY[officer.get("key_id")] = officer
+    for party in PARTIES:
+        PARTIES_BY_NAME_LC[party["party_name"].lower()] = party
+        PARTIES_BY_SYMBOL[party["symbol"]] = party
+
+rebuild_indexes()
+
+# Running vote total, maintained by cast_vote and reset_system
+TOTAL_VOTES = sum(p.get("votes", 0) for p in PARTIES)
+
+# Batched persistence; sources resolve globals lazily so reset_system rebinds work
+STATE_TRACKER = DirtyTracker({
+    VOTERS_FILE: lambda: VOTERS,
+    FRAUD_FILE: lambda: FRAUDS,
+    OFFICERS_FILE: lambda: OFFICERS,
+    PARTIES_FILE: lambda: PARTIES,
+})
+if _VOTERS_BEHIND_LOG:
+    STATE_TRACKER.mark_dirty([VOTERS_FILE])
+if _PARTIES_BEHIND_LOG:
+    STATE_TRACKER.mark_dirty([PARTIES_FILE])
+
+# Hand the old whole-array chain file to SimpleBlockchain, whose load_chain
+# validates the legacy format and rewrites it one block per line
+if not os.path.exists(CHAIN_FILE) and os.path.exists(LEGACY_CHAIN_FILE):
+    os.replace(LEGACY_CHAIN_FILE, CHAIN_FILE)
 
 # Initialize blockchain
 try:
@@ -81,75 +366,181 @@ except Exception as e:
     print(f"Blockchain initialization error: {e}")
     BLOCKCHAIN = SimpleBlockchain(difficulty=2, chain_file=CHAIN_FILE)
 
+# State version bumped on every mutation, and the dashboard payload built for it
+_STATE_VERSION = 0
+_DASH_CACHE = (-1, None)  # (version, payload), rebound as a whole
+# Response caches hold one (version, expires, payload) entry, replaced as a whole
+_HOME_CACHE = {"entry": (-1, 0.0, None)}
+_STATUS_CACHE = {"entry": (-1, 0.0, None)}
+
+def purge_sessions():
+    """Drop expired login sessions."""
+    now = time.time()
+    expired = [sid for sid, session in SESSIONS.items() if session["expires"] < now]
+    for sid in expired:
+        del SESSIONS[sid]
+
+def bump_state_version():
+    """Mark in-memory state as changed so cached responses get rebuilt."""
+    global _STATE_VERSION
+    _STATE_VERSION += 1
+
+def cached_response(cache, build):
+    """Serve pre-serialized JSON, rebuilding it on expiry or state change."""
+    now = time.monotonic()
+    version, expires, payload = cache["entry"]
+    if now >= expires or version != _STATE_VERSION:
+        # Build before publishing; a mutation during build() leaves a stale version behind
+        version = _STATE_VERSION
+        payload = orjson.dumps(build())
+        cache["entry"] = (version, now + RESPONSE_CACHE_TTL, payload)
+    return Response(payload, mimetype="application/json")
+
+# Background BB84 key generation so cast_vote does not run the simulation inline
+KEY_POOL = queue.Queue(maxsize=KEY_POOL_SIZE)
+
+def _fill_key_pool():
+    while True:
+        try:
+            KEY_POOL.put(bb84_shared_key(key_length=QUANTUM_KEY_LENGTH, debug=False))
+        except Exception as e:
+            print(f"Key pool generation error: {e}")
+            time.sleep(1)
+
+def next_quantum_key():
+    """Take a pre-generated quantum key, generating one inline if the pool is dry."""
+    try:
+        return KEY_POOL.get(timeout=KEY_POOL_TIMEOUT)
+    except queue.Empty:
+        return bb84_shared_key(key_length=QUANTUM_KEY_LENGTH, debug=False)
+
+threading.Thread(target=_fill_key_pool, daemon=True).start()
+
+# Proof-of-work runs off the request thread; one worker keeps blocks in order
+MINING_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="miner")
+
+def _mine_vote_block(chain, block_data):
+    block = chain.add_block(block_data)
+    bump_state_version()
+    return block
+
+def drain_mining():
+    """Block until every queued vote block has been mined."""
+    MINING_EXECUTOR.submit(lambda: None).result()
+
+def build_vote_record(key_bytes, vote_data):
+    """Encrypt a vote payload and build its stored record."""
+    # orjson emits bytes directly; the hash covers the raw IV + ciphertext
+    encrypted_bytes = aes_encrypt_bytes(key_bytes, orjson.dumps(vote_data))
+    return {
+        "encrypted_data": base64.b64encode(encrypted_bytes).decode(),
+        "vote_hash": hashlib.sha256(encrypted_bytes).hexdigest(),
+        "timestamp": vote_data["timestamp"],
+        "quantum_key_id": hashlib.sha256(key_bytes).hexdigest()[:16],
+        # Plaintext like the vote's chain block; lets startup recover party tallies
+        "party_name": vote_data["party_name"]
+    }
+
 app = Flask(__name__)
 CORS(app)
 
-@app.route("/")
-def home():
-    """Root endpoint with system status."""
-    return jsonify({
+def _home_payload():
+    return {
         "system": "Quantum + Blockchain Secure Voting API",
         "status": "running",
         "version": "2.0",
         "blockchain_valid": BLOCKCHAIN.is_valid(),
-        "timestamp": datetime.now().isoformat()
-    })
+        "timestamp": now_iso()
+    }
 
-@app.route("/status")
-def system_status():
-    """Get detailed system status."""
-    return jsonify({
+def _status_payload():
+    return {
         "voters_count": len(VOTERS),
         "parties_count": len(PARTIES),
         "officers_count": len(OFFICERS),
         "fraud_cases": len(FRAUDS),
         "blockchain_blocks": len(BLOCKCHAIN.chain),
         "blockchain_valid": BLOCKCHAIN.is_valid(),
-        "total_votes": sum(p.get("votes", 0) for p in PARTIES)
+        "total_votes": TOTAL_VOTES
+    }
+
+@app.route("/")
+def home():
+    """Root endpoint with system status."""
+    return cached_response(_HOME_CACHE, _home_payload)
+
+@app.route("/status")
+def system_status():
+    """Get detailed system status."""
+    return cached_response(_STATUS_CACHE, _status_payload)
+
+DASHBOARD_VOTER_BATCH = 256  # voters serialized per streamed chunk
+
+def _iter_dashboard_chunks():
+    """Yield the dashboard JSON in pieces, serializing voters one batch at a time."""
+    total_votes = TOTAL_VOTES
+    
+    yield b'{"fraudulent_voter_ids":' + orjson.dumps(FRAUDS) + b',"voters":['
+    
+    # Get voter status information without materializing a list of dicts
+    batch = []
+    sep = b""
+    for vid, voter in list(VOTERS.items()):
+        batch.append(orjson.dumps({
+            "name": voter.name,
+            "id_number": vid,
+            "has_voted": voter.has_voted,
+            "is_fraud": vid in FRAUDS_SET
+        }))
+        if len(batch) >= DASHBOARD_VOTER_BATCH:
+            yield sep + b",".join(batch)
+            batch = []
+            sep = b","
+    if batch:
+        yield sep + b",".join(batch)
+    
+    tail = orjson.dumps({
+        "polling_officers": OFFICERS,
+        "fraud_votes": FRAUDS,
+        "parties_votes": [
+            {
+                "party_name": p["party_name"],
+                "symbol": p["symbol"],
+                "votes": p["votes"],
+                "percentage": round((p["votes"] / total_votes * 100), 2) if total_votes > 0 else 0
+            }
+            for p in PARTIES
+        ],
+        "system_stats": {
+            "total_voters": len(VOTERS),
+            "total_votes": total_votes,
+            "fraud_cases": len(FRAUDS),
+            "blockchain_blocks": len(BLOCKCHAIN.chain),
+            "blockchain_valid": BLOCKCHAIN.is_valid()
+        }
     })
+    yield b"]," + tail[1:]
+
+def _stream_dashboard(version):
+    """Stream a freshly built dashboard and cache it once fully sent."""
+    global _DASH_CACHE
+    chunks = []
+    for chunk in _iter_dashboard_chunks():
+        chunks.append(chunk)
+        yield chunk
+    if version == _STATE_VERSION:
+        _DASH_CACHE = (version, b"".join(chunks))
 
 # Dashboard endpoint with enhanced data
 @app.route("/dashboard", methods=["GET"])
 def dashboard():
     """Get comprehensive dashboard data."""
-    try:
-        # Calculate vote statistics
-        total_votes = sum(p.get("votes", 0) for p in PARTIES)
-        
-        # Get voter status information
-        voters_with_status = []
-        for vid, voter in VOTERS.items():
-            voters_with_status.append({
-                "name": voter["name"],
-                "id_number": vid,
-                "has_voted": voter.get("has_voted", False),
-                "is_fraud": vid in FRAUDS
-            })
-        
-        return jsonify({
-            "fraudulent_voter_ids": FRAUDS,
-            "voters": voters_with_status,
-            "polling_officers": OFFICERS,
-            "fraud_votes": FRAUDS,
-            "parties_votes": [
-                {
-                    "party_name": p["party_name"],
-                    "symbol": p["symbol"],
-                    "votes": p["votes"],
-                    "percentage": round((p["votes"] / total_votes * 100), 2) if total_votes > 0 else 0
-                }
-                for p in PARTIES
-            ],
-            "system_stats": {
-                "total_voters": len(VOTERS),
-                "total_votes": total_votes,
-                "fraud_cases": len(FRAUDS),
-                "blockchain_blocks": len(BLOCKCHAIN.chain),
-                "blockchain_valid": BLOCKCHAIN.is_valid()
-            }
-        })
-    except Exception as e:
-        return jsonify({"error": f"Dashboard error: {str(e)}"}), 500
+    # Errors raised while streaming surface after the headers are sent, so there is no
+    # JSON 500 here; the app-level 500 handler still covers anything before the stream
+    version, payload = _DASH_CACHE
+    if version == _STATE_VERSION:
+        return Response(payload, mimetype="application/json")
+    return Response(_stream_dashboard(_STATE_VERSION), mimetype="application/json")
 
 # Enhanced Admin Functions
 @app.route("/admin_login", methods=["POST"])
@@ -160,20 +551,20 @@ def admin_login():
         password = data.get("password")
         
         if password == "admin@123":
+            purge_sessions()
             session_id = str(uuid.uuid4())
             SESSIONS[session_id] = {
                 "user_type": "admin",
-                "login_time": datetime.now().isoformat(),
-                "expires": (datetime.now().timestamp() + 3600)  # 1 hour
+                "login_time": now_iso(),
+                "expires": (time.time() + 3600)  # 1 hour
             }
-            save_json(SESSIONS_FILE, SESSIONS)
             log_activity("admin_login", "admin")
-            return jsonify({"ok": True, "session_id": session_id})
+            return json_response({"ok": True, "session_id": session_id})
         
         log_activity("admin_login_failed", "admin", {"reason": "invalid_password"})
-        return jsonify({"ok": False, "error": "Invalid admin credentials"}), 401
+        return json_response({"ok": False, "error": "Invalid admin credentials"}), 401
     except Exception as e:
-        return jsonify({"error": f"Login error: {str(e)}"}), 500
+        return json_response({"error": f"Login error: {str(e)}"}), 500
 
 @app.route("/register_officer", methods=["POST"])
 def register_officer():
@@ -184,39 +575,41 @@ def register_officer():
         number = data.get("number", "").strip()
         
         if not name or not number:
-            return jsonify({"ok": False, "error": "Name and number required"}), 400
+            return json_response({"ok": False, "error": "Name and number required"}), 400
         
         # Validate officer number format
         if not number.isalnum() or len(number) < 3:
-            return jsonify({"ok": False, "error": "Officer number must be alphanumeric and at least 3 characters"}), 400
+            return json_response({"ok": False, "error": "Officer number must be alphanumeric and at least 3 characters"}), 400
         
         # Check if officer number already exists
-        for officer in OFFICERS:
-            if officer.get("number") == number:
-                return jsonify({"ok": False, "error": "Officer number already exists"}), 400
-        
-        # Generate secure 4-digit key ID
-        key_id = str(random.randint(1000, 9999))
+        if number in OFFICERS_BY_NUMBER:
+            return json_response({"ok": False, "error": "Officer number already exists"}), 400
         
-        # Ensure unique key ID
-        while any(o.get("key_id") == key_id for o in OFFICERS):
-            key_id = str(random.randint(1000, 9999))
+        # Generate secure, unique 4-digit key ID
+        while True:
+            key_id = str(1000 + secrets.randbelow(9000))
+            if key_id not in OFFICERS_BY_KEY:
+                break
         
         officer = {
             "name": name,
             "number": number,
             "key_id": key_id,
-            "registered_at": datetime.now().isoformat(),
+            "registered_at": now_iso(),
             "status": "active"
         }
         
         OFFICERS.append(officer)
-        save_json(OFFICERS_FILE, OFFICERS)
+        OFFICERS_BY_NUMBER[number] = officer
+        OFFICERS_BY_KEY[key_id] = officer
+        STATE_TRACKER.mark_dirty([OFFICERS_FILE])
+        bump_state_version()
+        STATE_TRACKER.flush_if_batch_full()
         log_activity("officer_registered", "admin", {"officer_number": number, "key_id": key_id})
         
-        return jsonify({"ok": True, "key_id": key_id})
+        return json_response({"ok": True, "key_id": key_id})
     except Exception as e:
-        return jsonify({"error": f"Officer registration error: {str(e)}"}), 500
+        return json_response({"error": f"Officer registration error: {str(e)}"}), 500
 
 @app.route("/register_party", methods=["POST"])
 def register_party():
@@ -227,38 +620,42 @@ def register_party():
         symbol = data.get("symbol", "").strip()
         
         if not party_name or not symbol:
-            return jsonify({"ok": False, "error": "Party name and symbol required"}), 400
+            return json_response({"ok": False, "error": "Party name and symbol required"}), 400
         
         # Validate party name length
         if len(party_name) < 2 or len(party_name) > 100:
-            return jsonify({"ok": False, "error": "Party name must be 2-100 characters"}), 400
+            return json_response({"ok": False, "error": "Party name must be 2-100 characters"}), 400
         
         # Check if party already exists
-        for party in PARTIES:
-            if party["party_name"].lower() == party_name.lower():
-                return jsonify({"ok": False, "error": "Party name already exists"}), 400
-            if party["symbol"] == symbol:
-                return jsonify({"ok": False, "error": "Party symbol already exists"}), 400
+        name_lc = party_name.lower()
+        if name_lc in PARTIES_BY_NAME_LC:
+            return json_response({"ok": False, "error": "Party name already exists"}), 400
+        if symbol in PARTIES_BY_SYMBOL:
+            return json_response({"ok": False, "error": "Party symbol already exists"}), 400
         
         # Generate unique party ID
-        party_id = f"party_{len(PARTIES)+1}_{party_name.lower().replace(' ', '_')[:20]}"
+        party_id = f"party_{len(PARTIES)+1}_{name_lc.replace(' ', '_')[:20]}"
         
         new_party = {
             "party_id": party_id,
             "party_name": party_name,
             "symbol": symbol,
             "votes": 0,
-            "registered_at": datetime.now().isoformat(),
+            "registered_at": now_iso(),
             "status": "active"
         }
         
         PARTIES.append(new_party)
-        save_json(PARTIES_FILE, PARTIES)
+        PARTIES_BY_NAME_LC[name_lc] = new_party
+        PARTIES_BY_SYMBOL[symbol] = new_party
+        STATE_TRACKER.mark_dirty([PARTIES_FILE])
+        bump_state_version()
+        STATE_TRACKER.flush_if_batch_full()
         log_activity("party_registered", "admin", {"party_name": party_name, "symbol": symbol})
         
-        return jsonify({"ok": True, "party_id": party_id})
+        return json_response({"ok": True, "party_id": party_id})
     except Exception as e:
-        return jsonify({"error": f"Party registration error: {str(e)}"}), 500
+        return json_response({"error": f"Party registration error: {str(e)}"}), 500
 
 # Enhanced Officer Functions
 @app.route("/officer_login", methods=["POST"])
@@ -270,31 +667,31 @@ def officer_login():
         officer_key = data.get("key_id", "").strip()
         
         # Find officer with matching ID and key
-        for officer in OFFICERS:
-            if (officer.get("number") == officer_id and 
-                officer.get("key_id") == officer_key and 
-                officer.get("status") == "active"):
-                
-                session_id = str(uuid.uuid4())
-                SESSIONS[session_id] = {
-                    "user_type": "officer",
-                    "officer_id": officer_id,
-                    "login_time": datetime.now().isoformat(),
-                    "expires": (datetime.now().timestamp() + 3600)  # 1 hour
-                }
-                save_json(SESSIONS_FILE, SESSIONS)
-                log_activity("officer_login", officer_id)
-                
-                return jsonify({
-                    "ok": True, 
-                    "officer": officer,
-                    "session_id": session_id
-                })
+        officer = OFFICERS_BY_KEY.get(officer_key)
+        if (officer and
+            officer.get("number") == officer_id and 
+            officer.get("status") == "active"):
+            
+            purge_sessions()
+            session_id = str(uuid.uuid4())
+            SESSIONS[session_id] = {
+                "user_type": "officer",
+                "officer_id": officer_id,
+                "login_time": now_iso(),
+                "expires": (time.time() + 3600)  # 1 hour
+            }
+            log_activity("officer_login", officer_id)
+            
+            return json_response({
+                "ok": True, 
+                "officer": officer,
+                "session_id": session_id
+            })
         
         log_activity("officer_login_failed", officer_id, {"reason": "invalid_credentials"})
-        return jsonify({"ok": False, "error": "Invalid Officer credentials"}), 401
+        return json_response({"ok": False, "error": "Invalid Officer credentials"}), 401
     except Exception as e:
-        return jsonify({"error": f"Officer login error: {str(e)}"}), 500
+        return json_response({"error": f"Officer login error: {str(e)}"}), 500
 
 # Enhanced Voting Functions
 @app.route("/verify_biometric", methods=["POST"])
@@ -306,40 +703,41 @@ def verify_biometric():
         biometric_type = data.get("type", "thumb")
         
         if not voter_id:
-            return jsonify({"ok": False, "error": "Voter ID required"}), 400
+            return json_response({"ok": False, "error": "Voter ID required"}), 400
         
         voter = VOTERS.get(voter_id)
         if not voter:
             log_activity("biometric_verification_failed", voter_id, {"reason": "voter_not_found"})
-            return jsonify({"ok": False, "error": "Voter not found"}), 404
-        
-        # Enhanced fraud detection
-        if voter.get("has_voted", False):
-            if voter_id not in FRAUDS:
+            return json_response({"ok": False, "error": "Voter not found"}), 404
+        
+        # Enhanced fraud detection: repeat voters and known fraud cases
+        has_voted = voter.has_voted
+        if has_voted or voter_id in FRAUDS_SET:
+            if not has_voted:
+                log_activity("biometric_verification_failed", voter_id, {"reason": "voter_marked_fraud"})
+                return json_response({"ok": False, "error": "Voter access denied - fraudulent activity detected"}), 403
+            if voter_id not in FRAUDS_SET:
                 FRAUDS.append(voter_id)
-                save_json(FRAUD_FILE, FRAUDS)
+                FRAUDS_SET.add(voter_id)
+                STATE_TRACKER.mark_dirty([FRAUD_FILE])
+                bump_state_version()
+                STATE_TRACKER.flush_if_batch_full()
                 log_activity("fraud_detected", voter_id, {"type": "multiple_voting_attempt"})
-            return jsonify({"ok": False, "error": "Fraud detected! Voter has already voted"}), 400
-        
-        # Check if voter is already marked as fraudulent
-        if voter_id in FRAUDS:
-            log_activity("biometric_verification_failed", voter_id, {"reason": "voter_marked_fraud"})
-            return jsonify({"ok": False, "error": "Voter access denied - fraudulent activity detected"}), 403
+            return json_response({"ok": False, "error": "Fraud detected! Voter has already voted"}), 400
         
         # Simulate biometric verification with random failure for realism
-        if random.random() < 0.05:  # 5% chance of biometric failure
+        if random.getrandbits(10) < 51:  # ~5% (51/1024) chance of biometric failure
             log_activity("biometric_verification_failed", voter_id, {"reason": "biometric_mismatch"})
-            return jsonify({"ok": False, "error": f"{biometric_type.title()} biometric verification failed. Please try again."}), 400
+            return json_response({"ok": False, "error": f"{biometric_type.title()} biometric verification failed. Please try again."}), 400
         
-        # Update voter with biometric verification timestamp
-        voter["biometric_verified"] = datetime.now().isoformat()
-        voter["biometric_type"] = biometric_type
-        save_json(VOTERS_FILE, VOTERS)
+        # Record verification in memory only; cast_vote persists it with the vote
+        voter.biometric_verified = now_iso()
+        voter.biometric_type = biometric_type
         
         log_activity("biometric_verified", voter_id, {"type": biometric_type})
-        return jsonify({"ok": True, "message": f"{biometric_type.title()} biometric verified successfully"})
+        return json_response({"ok": True, "message": f"{biometric_type.title()} biometric verified successfully"})
     except Exception as e:
-        return jsonify({"error": f"Biometric verification error: {str(e)}"}), 500
+        return json_response({"error": f"Biometric verification error: {str(e)}"}), 500
 
 @app.route("/get_parties", methods=["GET"])
 def get_parties():
@@ -353,81 +751,74 @@ def get_parties():
             }
             for p in PARTIES if p.get("status", "active") == "active"
         ]
-        return jsonify({"parties": parties_for_ballot})
+        return json_response({"parties": parties_for_ballot})
     except Exception as e:
-        return jsonify({"error": f"Error loading parties: {str(e)}"}), 500
+        return json_response({"error": f"Error loading parties: {str(e)}"}), 500
 
 @app.route("/cast_vote", methods=["POST"])
 def cast_vote():
     """Enhanced vote casting with quantum encryption and blockchain."""
+    global TOTAL_VOTES
     try:
         data = request.get_json()
         voter_id = data.get("voter_id", "").strip()
         party_name = data.get("party_name", "").strip()
         
         if not voter_id or not party_name:
-            return jsonify({"ok": False, "error": "Voter ID and party required"}), 400
+            return json_response({"ok": False, "error": "Voter ID and party required"}), 400
         
         voter = VOTERS.get(voter_id)
         if not voter:
-            return jsonify({"ok": False, "error": "Voter not registered"}), 404
+            return json_response({"ok": False, "error": "Voter not registered"}), 404
         
         # Enhanced fraud detection
-        if voter.get("has_voted", False):
-            if voter_id not in FRAUDS:
+        if voter.has_voted:
+            if voter_id not in FRAUDS_SET:
                 FRAUDS.append(voter_id)
-                save_json(FRAUD_FILE, FRAUDS)
+                FRAUDS_SET.add(voter_id)
+                STATE_TRACKER.mark_dirty([FRAUD_FILE])
+                bump_state_version()
+                STATE_TRACKER.flush_if_batch_full()
                 log_activity("fraud_detected", voter_id, {"type": "multiple_voting_attempt"})
-            return jsonify({"ok": False, "error": "Fraud detected! Multiple voting attempt"}), 400
+            return json_response({"ok": False, "error": "Fraud detected! Multiple voting attempt"}), 400
         
         # Verify biometric was completed
-        if not voter.get("biometric_verified"):
-            return jsonify({"ok": False, "error": "Biometric verification required"}), 400
+        if not voter.biometric_verified:
+            return json_response({"ok": False, "error": "Biometric verification required"}), 400
         
         # Find and validate party
-        party_found = False
-        for party in PARTIES:
-            if party["party_name"] == party_name and party.get("status", "active") == "active":
-                party["votes"] += 1
-                party_found = True
-                break
+        party = PARTIES_BY_NAME_LC.get(party_name.lower())
+        if not party or party.get("status", "active") != "active":
+            return json_response({"ok": False, "error": "Invalid or inactive party"}), 400
         
-        if not party_found:
-            return jsonify({"ok": False, "error": "Invalid or inactive party"}), 400
+        party_name = party["party_name"]
+        party["votes"] += 1
+        TOTAL_VOTES += 1
         
         # Mark voter as having voted
-        voter["has_voted"] = True
-        voter["vote_timestamp"] = datetime.now().isoformat()
+        voter.has_voted = True
+        voter.vote_timestamp = now_iso()
         
         # Generate quantum-encrypted vote record
         try:
-            # Generate quantum key for this vote
-            key_bytes = bb84_shared_key(key_length=32, debug=False)
+            # Take a pre-generated quantum key for this vote
+            key_bytes = next_quantum_key()
             
             # Create comprehensive vote data
             vote_data = {
                 "voter_id": voter_id,
                 "party_name": party_name,
-                "timestamp": datetime.now().isoformat(),
-                "biometric_type": voter.get("biometric_type", "unknown"),
+                "timestamp": now_iso(),
+                "biometric_type": voter.biometric_type or "unknown",
                 "vote_id": str(uuid.uuid4())
             }
             
-            # Encrypt the vote
-            encrypted_vote = aes_encrypt(key_bytes, json.dumps(vote_data).encode())
-            
-            # Store encrypted vote with metadata
-            vote_record = {
-                "encrypted_data": encrypted_vote,
-                "vote_hash": hashlib.sha256(encrypted_vote.encode()).hexdigest(),
-                "timestamp": vote_data["timestamp"],
-                "quantum_key_id": hashlib.sha256(key_bytes).hexdigest()[:16]
-            }
-            
-            VOTES.setdefault(voter_id, []).append(vote_record)
+            # Encrypt the vote and store it with metadata
+            vote_record = build_vote_record(key_bytes, vote_data)
+            append_vote(voter_id, vote_record)
             
-            # Add to blockchain for tamper-proofing
-            BLOCKCHAIN.add_block({
+            # Queue the block for tamper-proofing; mining completes asynchronously
+            MINING_EXECUTOR.submit(_mine_vote_block, BLOCKCHAIN, {
                 "voter_id": voter_id,
                 "vote_hash": vote_record["vote_hash"],
                 "party_name": party_name,
@@ -441,21 +832,22 @@ def cast_vote():
             pass
         
         # Save all data
-        save_json(VOTERS_FILE, VOTERS)
-        save_json(PARTIES_FILE, PARTIES)
-        save_json(VOTES_FILE, VOTES)
+        STATE_TRACKER.mark_dirty([VOTERS_FILE, PARTIES_FILE])
+        bump_state_version()
+        STATE_TRACKER.flush_if_batch_full()
         
         log_activity("vote_cast", voter_id, {"party": party_name})
         
-        return jsonify({
+        return json_response({
             "ok": True,
             "message": "Vote recorded successfully",
             "vote_id": vote_data.get("vote_id", "unknown"),
-            "blockchain_block": len(BLOCKCHAIN.chain) - 1
-        })
+            "blockchain_block": None,
+            "blockchain_status": "pending"
+        }), 202
         
     except Exception as e:
-        return jsonify({"error": f"Vote casting error: {str(e)}"}), 500
+        return json_response({"error": f"Vote casting error: {str(e)}"}), 500
 
 # Enhanced Results and System Management
 @app.route("/get_results", methods=["GET"])
@@ -463,11 +855,11 @@ def get_results():
     """Get election results with detailed statistics."""
     try:
         if not PARTIES:
-            return jsonify({"results": [], "message": "No parties registered"})
+            return json_response({"results": [], "message": "No parties registered"})
         
         # Sort parties by vote count (descending)
         sorted_parties = sorted(PARTIES, key=lambda p: p["votes"], reverse=True)
-        total_votes = sum(p["votes"] for p in PARTIES)
+        total_votes = TOTAL_VOTES
         
         results = []
         for rank, party in enumerate(sorted_parties, 1):
@@ -480,14 +872,14 @@ def get_results():
                 "percentage": round(percentage, 2)
             })
         
-        return jsonify({
+        return json_response({
             "results": results,
             "total_votes": total_votes,
             "total_parties": len(PARTIES),
-            "last_updated": datetime.now().isoformat()
+            "last_updated": now_iso()
         })
     except Exception as e:
-        return jsonify({"error": f"Results error: {str(e)}"}), 500
+        return json_response({"error": f"Results error: {str(e)}"}), 500
 
 @app.route("/reset_system", methods=["POST"])
 def reset_system():
@@ -499,34 +891,35 @@ def reset_system():
         # Verify admin password
         if password != "admin@123":
             log_activity("system_reset_failed", "admin", {"reason": "invalid_password"})
-            return jsonify({"ok": False, "error": "Invalid admin password"}), 401
+            return json_response({"ok": False, "error": "Invalid admin password"}), 401
         
         # Clear all data
-        global VOTERS, VOTES, FRAUDS, OFFICERS, PARTIES, BLOCKCHAIN, SESSIONS
+        global VOTERS, VOTES, FRAUDS, OFFICERS, PARTIES, BLOCKCHAIN, SESSIONS, TOTAL_VOTES
         
         VOTERS = {}
         VOTES = {}
+        clear_vote_log()
         FRAUDS = []
         OFFICERS = []
         PARTIES = []
         SESSIONS = {}
+        TOTAL_VOTES = 0
+        rebuild_indexes()
         
-        # Reset blockchain
+        # Reset blockchain once queued blocks have landed on the old chain
+        drain_mining()
         BLOCKCHAIN = SimpleBlockchain(difficulty=3, chain_file=CHAIN_FILE)
         
         # Save empty data
-        save_json(VOTERS_FILE, VOTERS)
-        save_json(VOTES_FILE, VOTES)
-        save_json(FRAUD_FILE, FRAUDS)
-        save_json(OFFICERS_FILE, OFFICERS)
-        save_json(PARTIES_FILE, PARTIES)
-        save_json(SESSIONS_FILE, SESSIONS)
+        STATE_TRACKER.mark_dirty([VOTERS_FILE, FRAUD_FILE, OFFICERS_FILE, PARTIES_FILE])
+        STATE_TRACKER.flush()
+        bump_state_version()
         
-        log_activity("system_reset", "admin", {"timestamp": datetime.now().isoformat()})
+        log_activity("system_reset", "admin", {"timestamp": now_iso()})
         
-        return jsonify({"ok": True, "message": "System reset successfully"})
+        return json_response({"ok": True, "message": "System reset successfully"})
     except Exception as e:
-        return jsonify({"error": f"System reset error: {str(e)}"}), 500
+        return json_response({"error": f"System reset error: {str(e)}"}), 500
 
 # Additional utility endpoints
 @app.route("/register_voter", methods=["POST"])
@@ -539,32 +932,30 @@ def register_voter():
         password = data.get("password", "default123")
         
         if not vid or not name:
-            return jsonify({"ok": False, "error": "Voter ID and name required"}), 400
+            return json_response({"ok": False, "error": "Voter ID and name required"}), 400
         
         # Validate voter ID format
         if len(vid) < 3 or not vid.replace("-", "").replace("_", "").isalnum():
-            return jsonify({"ok": False, "error": "Voter ID must be at least 3 characters and alphanumeric"}), 400
+            return json_response({"ok": False, "error": "Voter ID must be at least 3 characters and alphanumeric"}), 400
         
         if vid in VOTERS:
-            return jsonify({"ok": False, "error": "Voter ID already registered"}), 400
-        
-        VOTERS[vid] = {
-            "name": name,
-            "password": generate_password_hash(password),
-            "iris_sample": data.get("iris_sample", "simulated_iris"),
-            "session_key": None,
-            "session_id": None,
-            "has_voted": False,
-            "registered_at": datetime.now().isoformat(),
-            "status": "active"
-        }
-        
-        save_json(VOTERS_FILE, VOTERS)
+            return json_response({"ok": False, "error": "Voter ID already registered"}), 400
+        
+        VOTERS[vid] = Voter(
+            name=name,
+            password=generate_password_hash(password),
+            iris_sample=data.get("iris_sample", "simulated_iris"),
+            registered_at=now_iso()
+        )
+        
+        STATE_TRACKER.mark_dirty([VOTERS_FILE])
+        bump_state_version()
+        STATE_TRACKER.flush_if_batch_full()
         log_activity("voter_registered", vid, {"name": name})
         
-        return jsonify({"ok": True, "message": "Voter registered successfully"})
+        return json_response({"ok": True, "message": "Voter registered successfully"})
     except Exception as e:
-        return jsonify({"error": f"Voter registration error: {str(e)}"}), 500
+        return json_response({"error": f"Voter registration error: {str(e)}"}), 500
 
 @app.route("/end_session", methods=["POST"])
 def end_session():
@@ -573,47 +964,44 @@ def end_session():
         data = request.get_json()
         key_id = data.get("officer_key_id", "").strip()
         
-        for officer in OFFICERS:
-            if officer.get("key_id") == key_id and officer.get("status") == "active":
-                log_activity("session_ended", officer.get("number"), {"key_id": key_id})
-                return jsonify({"ok": True, "message": "Session ended successfully"})
+        officer = OFFICERS_BY_KEY.get(key_id)
+        if officer and officer.get("status") == "active":
+            log_activity("session_ended", officer.get("number"), {"key_id": key_id})
+            return json_response({"ok": True, "message": "Session ended successfully"})
         
-        return jsonify({"ok": False, "error": "Invalid Officer Key-ID"}), 403
+        return json_response({"ok": False, "error": "Invalid Officer Key-ID"}), 403
     except Exception as e:
-        return jsonify({"error": f"Session end error: {str(e)}"}), 500
+        return json_response({"error": f"Session end error: {str(e)}"}), 500
 
 @app.route("/activity_log", methods=["GET"])
 def get_activity_log():
     """Get system activity log for audit purposes."""
     try:
-        log_file = os.path.join(DATA_DIR, "activity_log.json")
-        logs = load_json(log_file, [])
-        
         # Return last 100 entries
-        return jsonify({
-            "logs": logs[-100:],
-            "total_entries": len(logs)
+        return json_response({
+            "logs": list(ACTIVITY_LOG_TAIL),
+            "total_entries": _ACTIVITY_LOG_STATS["total"]
         })
     except Exception as e:
-        return jsonify({"error": f"Activity log error: {str(e)}"}), 500
+        return json_response({"error": f"Activity log error: {str(e)}"}), 500
 
 # Error handlers
 @app.errorhandler(404)
 def not_found(error):
-    return jsonify({"error": "Endpoint not found"}), 404
+    return json_response({"error": "Endpoint not found"}), 404
 
 @app.errorhandler(500)
 def internal_error(error):
-    return jsonify({"error": "Internal server error"}), 500
+    return json_response({"error": "Internal server error"}), 500
 
 @app.errorhandler(400)
 def bad_request(error):
-    return jsonify({"error": "Bad request"}), 400
+    return json_response({"error": "Bad request"}), 400
 
 if __name__ == "__main__":
     print("🚀 Starting Quantum-Blockchain Secure Voting System")
     print("📊 Dashboard: http://localhost:5000")
-    print("🔐 Blockchain Status:", "Valid" if BLOCKCHAIN.is_valid() else "Invalid")
+    print("🔐 Blockchain Status:", "Valid" if BLOCKCHAIN.verify() else "Invalid")
     print("📝 Loaded:", len(VOTERS), "voters,", len(PARTIES), "parties,", len(OFFICERS), "officers")
     
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -142,7 +142,7 @@ def simulate_voting_process():
         }
         
         response = requests.post(f"{base_url}/cast_vote", json=vote_data)
-        if response.status_code != 200:
+        if response.status_code not in (200, 202):
             print("❌ Vote casting failed")
             return False
         
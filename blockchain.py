@@ -4,9 +4,50 @@ import json
 import hashlib
 import time
 import os
-from typing import List, Dict, Optional
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # stdlib json fallback keeps the module usable without orjson
+    orjson = None
+
+# Placeholder serialized in the nonce slot when splitting a block header
+NONCE_MARKER = "__NONCE__"
+_NONCE_MARKER_BYTES = json.dumps(NONCE_MARKER).encode()
+
+def _verify_block(block_data: Dict, target: int) -> bool:
+    """Re-serialize one block dict and check its stored hash and proof of work."""
+    header = json.dumps({
+        "index": block_data["index"],
+        "timestamp": block_data["timestamp"],
+        "data": block_data["data"],
+        "previous_hash": block_data["previous_hash"],
+        "nonce": block_data["nonce"]
+    }, sort_keys=True).encode()
+    digest = hashlib.sha256(header).digest()
+    return digest.hex() == block_data["hash"] and int.from_bytes(digest, "big") < target
+
+def _dump_line(block_data: Dict) -> bytes:
+    """Serialize one block as a chain file line (hashing always uses stdlib json)."""
+    if orjson is not None:
+        return orjson.dumps(block_data) + b"\n"
+    return json.dumps(block_data).encode() + b"\n"
+
+def _load_json(raw: bytes):
+    """Parse JSON bytes; both parsers raise json.JSONDecodeError subclasses."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _hashable(value: Any) -> Hashable:
+    """Freeze a JSON value into a hashable key that compares like the original."""
+    if isinstance(value, dict):
+        return frozenset((k, _hashable(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return tuple(_hashable(v) for v in value)
+    return value
+
 class Block:
     """Blockchain block with enhanced features."""
     
@@ -16,42 +57,74 @@ class Block:
         self.data = data
         self.previous_hash = previous_hash
         self.nonce = 0
+        self.digest = b""  # raw SHA-256 digest behind self.hash
+        # Header bytes around the nonce; block fields are not mutated after construction
+        self._header_prefix, self._header_suffix = self._header_parts()
         self.hash = self.compute_hash()
         self.created_at = datetime.now().isoformat()
+        self._dict_cache: Optional[Dict] = None  # set once the block is finalized
 
     def compute_hash(self) -> str:
-        """Compute SHA-256 hash of the block."""
+        """Compute SHA-256 hash of the block, keeping the raw digest in self.digest."""
         try:
-            block_string = json.dumps({
-                "index": self.index,
-                "timestamp": self.timestamp,
-                "data": self.data,
-                "previous_hash": self.previous_hash,
-                "nonce": self.nonce
-            }, sort_keys=True).encode()
-            return hashlib.sha256(block_string).hexdigest()
+            block_string = self._header_prefix + str(self.nonce).encode() + self._header_suffix
+            self.digest = hashlib.sha256(block_string).digest()
+            return self.digest.hex()
         except Exception as e:
             print(f"Hash computation error: {e}")
+            self.digest = bytes(32)
             return "0" * 64  # Fallback hash
 
+    def _header_parts(self) -> Tuple[bytes, bytes]:
+        """Split the serialized header around the nonce value.
+        
+        prefix + str(nonce).encode() + suffix is the canonical sort_keys JSON
+        header hashed by compute_hash() and mine().
+        """
+        template = json.dumps({
+            "index": self.index,
+            "timestamp": self.timestamp,
+            "data": self.data,
+            "previous_hash": self.previous_hash,
+            "nonce": NONCE_MARKER
+        }, sort_keys=True).encode()
+        # Keys are sorted, so the nonce slot follows "data" and is the last match
+        offset = template.rindex(_NONCE_MARKER_BYTES)
+        return template[:offset], template[offset + len(_NONCE_MARKER_BYTES):]
+
     def mine(self, difficulty: int = 2) -> bool:
         """Mine block with proof-of-work algorithm."""
         try:
-            prefix = "0" * difficulty
+            # difficulty leading hex zeros == whole zero bytes, plus a high nibble when odd
+            zeros, odd = divmod(difficulty, 2)
+            zero_prefix = bytes(zeros)
             start_time = time.time()
             max_iterations = 1000000  # Prevent infinite loops
             
-            iteration = 0
-            while not self.hash.startswith(prefix) and iteration < max_iterations:
-                self.nonce += 1
-                self.hash = self.compute_hash()
-                iteration += 1
+            # Each attempt only splices in the nonce digits
+            header_suffix = self._header_suffix
+            # Midstate: absorb the fixed prefix once; attempts only hash the tail
+            midstate = hashlib.sha256(self._header_prefix)
+            nonce = self.nonce
+            digest = bytes.fromhex(self.hash)
             
-            mining_time = time.time() - start_time
+            # Tight scan: range() drives the nonce, b"%d" formats it in one step
+            if not (digest[:zeros] == zero_prefix and (not odd or digest[zeros] < 16)):
+                for nonce in range(self.nonce + 1, self.nonce + max_iterations + 1):
+                    attempt = midstate.copy()
+                    attempt.update(b"%d" % nonce + header_suffix)
+                    digest = attempt.digest()
+                    if digest[:zeros] == zero_prefix and (not odd or digest[zeros] < 16):
+                        break
+                else:
+                    print(f"Mining timeout after {max_iterations} iterations")
+                    return False
             
-            if iteration >= max_iterations:
-                print(f"Mining timeout after {max_iterations} iterations")
-                return False
+            self.nonce = nonce
+            self.digest = digest
+            self.hash = digest.hex()
+            self._dict_cache = self._build_dict()
+            mining_time = time.time() - start_time
             
             print(f"Block mined in {mining_time:.2f}s with nonce {self.nonce}")
             return True
@@ -60,7 +133,12 @@ class Block:
             return False
 
     def to_dict(self) -> Dict:
-        """Convert block to dictionary."""
+        """Convert block to dictionary; finalized blocks return a shared cached dict."""
+        if self._dict_cache is not None:
+            return self._dict_cache
+        return self._build_dict()
+
+    def _build_dict(self) -> Dict:
         return {
             "index": self.index,
             "timestamp": self.timestamp,
@@ -74,17 +152,31 @@ class Block:
 class SimpleBlockchain:
     """Enhanced blockchain implementation for voting system."""
     
-    def __init__(self, difficulty: int = 2, chain_file: str = "data/chain.json"):
+    def __init__(self, difficulty: int = 2, chain_file: str = "data/chain.jsonl"):
         self.difficulty = max(1, min(difficulty, 4))  # Limit difficulty for faster mining
         self.chain_file = chain_file
         self.chain: List[Block] = []
         self.pending_transactions: List[Dict] = []
+        # data key -> frozen value -> chain positions, for search_blocks
+        self._index: Dict[str, Dict[Hashable, Set[int]]] = {}
+        # Result of the last chain walk; None until checked or after the chain is replaced
+        self._is_valid_cached: Optional[bool] = None
         
         # Ensure data directory exists
         os.makedirs(os.path.dirname(chain_file), exist_ok=True)
         
         self.load_chain()
 
+    @property
+    def difficulty(self) -> int:
+        return self._difficulty
+
+    @difficulty.setter
+    def difficulty(self, value: int):
+        # difficulty leading hex zeros == digest below 2**(256 - 4*difficulty)
+        self._difficulty = value
+        self._target = 1 << (256 - 4 * value)
+
     def create_genesis(self) -> bool:
         """Create genesis block."""
         try:
@@ -101,6 +193,8 @@ class SimpleBlockchain:
             
             if genesis.mine(self.difficulty):
                 self.chain = [genesis]
+                self._rebuild_index()
+                self._is_valid_cached = None
                 if self.save_chain():
                     print("✅ Genesis block created successfully")
                     return True
@@ -121,8 +215,26 @@ class SimpleBlockchain:
                 print("Chain file not found, creating genesis block...")
                 return self.create_genesis()
             
-            with open(self.chain_file, "r") as f:
-                raw_data = json.load(f)
+            with open(self.chain_file, "rb") as f:
+                raw = f.read()
+            
+            # One block per line; a leading "[" is the legacy whole-array format
+            legacy = raw.lstrip().startswith(b"[")
+            torn = False
+            if legacy:
+                raw_data = _load_json(raw)
+            else:
+                lines = [line for line in raw.splitlines() if line.strip()]
+                raw_data = []
+                for i, line in enumerate(lines):
+                    try:
+                        raw_data.append(_load_json(line))
+                    except json.JSONDecodeError:
+                        # Only the last line can be a partial write from an interrupted append
+                        if i != len(lines) - 1:
+                            raise
+                        print("Dropping partial last block left by an interrupted write...")
+                        torn = True
             
             if not raw_data or not isinstance(raw_data, list):
                 print("Empty or invalid chain file, creating new genesis block...")
@@ -146,7 +258,9 @@ class SimpleBlockchain:
                     )
                     block.nonce = block_data.get("nonce", 0)
                     block.hash = block_data["hash"]
+                    block.digest = bytes.fromhex(block.hash)
                     block.created_at = block_data.get("created_at", datetime.now().isoformat())
+                    block._dict_cache = block._build_dict()
                     
                     self.chain.append(block)
                     
@@ -156,10 +270,19 @@ class SimpleBlockchain:
                     return self.create_genesis()
             
             # Validate chain integrity
+            self._is_valid_cached = None
             if not self.is_valid():
                 print("❌ Loaded chain is invalid, creating new genesis block...")
                 return self.create_genesis()
             
+            self._rebuild_index()
+            
+            if legacy:
+                print("Migrating chain file to one block per line...")
+            if legacy or torn:
+                if not self.save_chain():
+                    return False
+            
             print(f"✅ Blockchain loaded with {len(self.chain)} blocks")
             return True
             
@@ -169,31 +292,55 @@ class SimpleBlockchain:
             return self.create_genesis()
 
     def save_chain(self) -> bool:
-        """Save blockchain to file with backup."""
+        """Rewrite the whole chain file atomically (genesis and migration only)."""
         try:
             # Ensure directory exists
             os.makedirs(os.path.dirname(self.chain_file), exist_ok=True)
             
-            # Create backup of existing chain
-            if os.path.exists(self.chain_file):
-                backup_file = f"{self.chain_file}.backup"
-                try:
-                    os.rename(self.chain_file, backup_file)
-                except OSError:
-                    pass  # Backup failed, continue anyway
+            # Write a temp file and swap it in; the old chain stays intact until os.replace
+            tmp_file = f"{self.chain_file}.tmp"
+            with open(tmp_file, "wb") as f:
+                f.writelines(_dump_line(block.to_dict()) for block in self.chain)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.chain_file)
             
-            # Save current chain
-            raw_data = [block.to_dict() for block in self.chain]
-            
-            with open(self.chain_file, "w") as f:
-                json.dump(raw_data, f, indent=2)
+            return True
             
+        except Exception as e:
+            print(f"Chain saving error: {e}")
+            return False
+
+    def _append_block(self, block: Block) -> bool:
+        """Append a single block to the chain file."""
+        try:
+            with open(self.chain_file, "ab") as f:
+                offset = f.tell()
+                try:
+                    f.write(_dump_line(block.to_dict()))
+                    f.flush()
+                    os.fsync(f.fileno())
+                except OSError:
+                    # Cut off a partial line so the next append starts clean
+                    f.truncate(offset)
+                    raise
             return True
             
         except Exception as e:
             print(f"Chain saving error: {e}")
             return False
 
+    def _index_block(self, position: int, block: Block):
+        """Add one block's data fields to the search index."""
+        for key, value in block.data.items():
+            self._index.setdefault(key, {}).setdefault(_hashable(value), set()).add(position)
+
+    def _rebuild_index(self):
+        """Rebuild the search index after the chain list is replaced."""
+        self._index = {}
+        for position, block in enumerate(self.chain):
+            self._index_block(position, block)
+
     def get_latest_block(self) -> Optional[Block]:
         """Get the latest block in the chain."""
         return self.chain[-1] if self.chain else None
@@ -231,7 +378,8 @@ class SimpleBlockchain:
             # Mine the block
             if new_block.mine(self.difficulty):
                 self.chain.append(new_block)
-                if self.save_chain():
+                if self._append_block(new_block):
+                    self._index_block(len(self.chain) - 1, new_block)
                     print(f"✅ Block #{new_block.index} added to blockchain")
                     return new_block
                 else:
@@ -247,7 +395,18 @@ class SimpleBlockchain:
             return None
 
     def is_valid(self) -> bool:
-        """Validate the entire blockchain."""
+        """Validate the entire blockchain, reusing the last result.
+        
+        add_block only appends blocks mined on the current tip, which cannot
+        change the outcome, so the chain is walked again only after it is
+        replaced. Use verify() for an on-demand full check.
+        """
+        if self._is_valid_cached is None:
+            self._is_valid_cached = self._check_chain()
+        return self._is_valid_cached
+
+    def _check_chain(self) -> bool:
+        """Walk the chain checking genesis, hashes, linkage, indexes and proof of work."""
         try:
             if not self.chain:
                 return False
@@ -277,8 +436,8 @@ class SimpleBlockchain:
                     print(f"❌ Block #{current.index} index error")
                     return False
                 
-                # Check proof of work
-                if not current.hash.startswith("0" * self.difficulty):
+                # Check proof of work on the digest compute_hash() just produced
+                if int.from_bytes(current.digest, "big") >= self._target:
                     print(f"❌ Block #{current.index} proof of work invalid")
                     return False
             
@@ -288,6 +447,30 @@ class SimpleBlockchain:
             print(f"Validation error: {e}")
             return False
 
+    def verify(self) -> bool:
+        """Fully re-verify the chain from each block's current fields.
+        
+        is_valid() hashes the header bytes cached when each Block was built;
+        this re-serializes every block, so in-memory edits are caught too.
+        The result replaces the one is_valid() has cached.
+        """
+        try:
+            self._is_valid_cached = self._check_chain()
+            if not self._is_valid_cached:
+                return False
+            
+            for block in self.chain[1:]:
+                # A fresh dict rather than to_dict(), so nothing cached is trusted
+                if not _verify_block(block._build_dict(), self._target):
+                    print(f"❌ Block #{block.index} hash or proof of work invalid")
+                    self._is_valid_cached = False
+                    return False
+            return True
+            
+        except Exception as e:
+            print(f"Validation error: {e}")
+            return False
+
     def get_chain_info(self) -> Dict:
         """Get comprehensive blockchain information."""
         try:
@@ -309,19 +492,20 @@ class SimpleBlockchain:
     def search_blocks(self, criteria: Dict) -> List[Block]:
         """Search blocks by criteria."""
         try:
-            matching_blocks = []
+            if not criteria:
+                return list(self.chain)
             
-            for block in self.chain:
-                match = True
-                for key, value in criteria.items():
-                    if key not in block.data or block.data[key] != value:
-                        match = False
-                        break
-                
-                if match:
-                    matching_blocks.append(block)
+            # Intersect the smallest candidate sets first
+            candidates = []
+            for key, value in criteria.items():
+                positions = self._index.get(key, {}).get(_hashable(value))
+                if not positions:
+                    return []
+                candidates.append(positions)
+            candidates.sort(key=len)
+            matches = set.intersection(*candidates)
             
-            return matching_blocks
+            return [self.chain[i] for i in sorted(matches)]
         except Exception as e:
             print(f"Block search error: {e}")
             return []
@@ -1,21 +1,42 @@
 # crypto_utils.py - AES encryption and decryption
 
-from Crypto.Cipher import AES
-from Crypto.Util.Padding import pad, unpad
-from Crypto.Random import get_random_bytes
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.padding import PKCS7
 import base64
+import os
+
+BLOCK_SIZE = 16  # AES block size in bytes
+
+class AESCBCEncryptor:
+    """AES-CBC encryptor for many payloads under one key.
+
+    The validated key is kept across calls; each payload still gets a fresh IV.
+    """
+
+    def __init__(self, key: bytes):
+        self._algorithm = algorithms.AES(key[:32])
+
+    def encrypt_bytes(self, plaintext: bytes) -> bytes:
+        iv = os.urandom(BLOCK_SIZE)
+        padder = PKCS7(BLOCK_SIZE * 8).padder()
+        padded = padder.update(plaintext) + padder.finalize()
+        encryptor = Cipher(self._algorithm, modes.CBC(iv)).encryptor()
+        return iv + encryptor.update(padded) + encryptor.finalize()
+
+    def encrypt(self, plaintext: bytes) -> str:
+        return base64.b64encode(self.encrypt_bytes(plaintext)).decode()
+
+def aes_encrypt_bytes(key: bytes, plaintext: bytes) -> bytes:
+    return AESCBCEncryptor(key).encrypt_bytes(plaintext)
 
 def aes_encrypt(key: bytes, plaintext: bytes) -> str:
-    iv = get_random_bytes(16)
-    cipher = AES.new(key[:32], AES.MODE_CBC, iv)
-    ct = cipher.encrypt(pad(plaintext, AES.block_size))
-    payload = iv + ct
-    return base64.b64encode(payload).decode()
+    return AESCBCEncryptor(key).encrypt(plaintext)
 
 def aes_decrypt(key: bytes, payload_b64: str) -> bytes:
     data = base64.b64decode(payload_b64)
-    iv = data[:16]
-    ct = data[16:]
-    cipher = AES.new(key[:32], AES.MODE_CBC, iv)
-    pt = unpad(cipher.decrypt(ct), AES.block_size)
+    iv = data[:BLOCK_SIZE]
+    ct = data[BLOCK_SIZE:]
+    decryptor = Cipher(algorithms.AES(key[:32]), modes.CBC(iv)).decryptor()
+    unpadder = PKCS7(BLOCK_SIZE * 8).unpadder()
+    pt = unpadder.update(decryptor.update(ct) + decryptor.finalize()) + unpadder.finalize()
     return pt
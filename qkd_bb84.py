@@ -1,38 +1,53 @@
 # qkd_bb84.py - BB84 Quantum Key Distribution simulated generation
 
-from qiskit import QuantumCircuit
+import math
 import numpy as np
 import hashlib
 
+# Seeded once from OS entropy; Generator draws are serialized by its bit generator lock
+_RNG = np.random.default_rng()
+
+def _bb84_circuit(alice_bits, alice_bases, bob_bases):
+    # Only used for debug output; qiskit is imported lazily so key generation never pays for it
+    from qiskit import QuantumCircuit
+    n = len(alice_bits)
+    qc = QuantumCircuit(n, n)
+    for i in range(n):
+        if alice_bits[i] == 1:
+            qc.x(i)
+        if alice_bases[i] == 1:
+            qc.h(i)
+    for i in range(n):
+        if bob_bases[i] == 1:
+            qc.h(i)
+    qc.measure(range(n), range(n))
+    return qc
+
+def _bb84_attempt(n):
+    """Run one simulated BB84 exchange of n qubits.
+
+    Returns (alice_bits, alice_bases, bob_bases, agreed), where agreed holds
+    Alice's bits at the positions where both bases match.
+    """
+    alice_bits, alice_bases, bob_bases = _RNG.integers(0, 2, size=(3, n), dtype=np.uint8)
+    agreed = alice_bits[alice_bases == bob_bases]
+    return alice_bits, alice_bases, bob_bases, agreed
+
 def bb84_shared_key_ibm(key_length=64, debug=False):
     max_attempts = 5
     attempt = 0
+    # Bases match with p=1/2; the margin puts key_length over 3 sd below the expected
+    # matches, so a retry (kept as a safety net) almost never happens
+    n = 2 * key_length + max(16, int(6 * math.sqrt(key_length)))
     while attempt < max_attempts:
-        n = key_length * 2
-        alice_bits = np.random.randint(2, size=n)
-        alice_bases = np.random.randint(2, size=n)
-        bob_bases = np.random.randint(2, size=n)
-        qc = QuantumCircuit(n, n)
-        for i in range(n):
-            if alice_bits[i] == 1:
-                qc.x(i)
-            if alice_bases[i] == 1:
-                qc.h(i)
-        for i in range(n):
-            if bob_bases[i] == 1:
-                qc.h(i)
-        qc.measure(range(n), range(n))
-        matches = (alice_bases == bob_bases)
-        shared_alice = alice_bits[matches]
-        agreed = shared_alice
+        alice_bits, alice_bases, bob_bases, agreed = _bb84_attempt(n)
         if len(agreed) >= key_length:
             break
         attempt += 1
     if len(agreed) < key_length:
         raise RuntimeError(f"Failed to generate enough matched bits after {max_attempts} attempts.")
     if debug:
-        print(qc.draw(output="text"))
+        print(_bb84_circuit(alice_bits, alice_bases, bob_bases).draw(output="text"))
     final_bits = agreed[:key_length]
-    bit_string = ''.join(str(int(b)) for b in final_bits)
-    key_bytes = hashlib.sha256(bit_string.encode()).digest()
+    key_bytes = hashlib.sha256(np.packbits(final_bits).tobytes()).digest()
     return key_bytes
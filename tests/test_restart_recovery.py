@@ -0,0 +1,50 @@
+# test_restart_recovery.py - votes must survive a crash before the write-back flush
+#
+# Run from the repository root: python -m unittest discover tests
+
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CAST_AND_CRASH = textwrap.dedent("""
+    import os, app
+    c = app.app.test_client()
+    assert c.post("/register_party", json={"party_name": "Green", "symbol": "G"}).get_json()["ok"]
+    assert c.post("/register_voter", json={"voter_id": "V001", "name": "Voter"}).get_json()["ok"]
+    for _ in range(50):  # biometric check fails at random
+        if c.post("/verify_biometric", json={"voter_id": "V001"}).get_json()["ok"]:
+            break
+    app.STATE_TRACKER.flush()  # party and voter are on disk before the vote
+    assert c.post("/cast_vote", json={"voter_id": "V001", "party_name": "green"}).status_code == 202
+    os._exit(0)  # die before the background flush writes voters.json / parties.json
+""")
+
+RESTART = textwrap.dedent("""
+    import os, app
+    c = app.app.test_client()
+    results = c.get("/get_results").get_json()
+    print(results["total_votes"], [p["votes"] for p in results["results"]], app.VOTERS["V001"].has_voted)
+    os._exit(0)
+""")
+
+class RestartRecoveryTest(unittest.TestCase):
+
+    def run_app(self, data_dir, script):
+        env = dict(os.environ, PYTHONPATH=REPO_DIR)
+        result = subprocess.run([sys.executable, "-c", script], cwd=data_dir, env=env,
+                                capture_output=True, text=True, timeout=120)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return result.stdout.strip().splitlines()[-1]
+
+    def test_vote_cast_before_flush_is_counted_after_restart(self):
+        with tempfile.TemporaryDirectory() as data_dir:
+            self.run_app(data_dir, CAST_AND_CRASH)
+            self.assertEqual(self.run_app(data_dir, RESTART), "1 [1] True")
+
+if __name__ == "__main__":
+    unittest.main()